@@ -8,12 +8,65 @@ This client shows three different ways to interact with background tasks:
 """
 
 import asyncio
+import time
 from datetime import datetime
 
 from fastmcp import Client
 
 from server import mcp
 
+# States after which a task will not change again
+TERMINAL_STATES = frozenset({"completed", "failed", "cancelled"})
+
+
+async def _poll_until_terminal(
+    task,
+    *,
+    initial: float = 1.0,
+    factor: float = 1.5,
+    cap: float = 30.0,
+    max_total_wait: float | None = None,
+):
+    """
+    Poll a task's status with exponential backoff until it reaches a terminal state.
+
+    Starts polling every `initial` seconds and multiplies the delay by `factor`
+    after each non-terminal status, up to `cap` seconds between polls.
+
+    Args:
+        task: The task returned by call_tool(..., task=True)
+        initial: Delay before the second poll, in seconds
+        factor: Multiplier applied to the delay after each poll
+        cap: Maximum delay between polls, in seconds
+        max_total_wait: Give up after this many seconds (None waits forever)
+
+    Returns:
+        The final task status
+
+    Raises:
+        TimeoutError: If the task doesn't finish within max_total_wait
+    """
+    start = time.monotonic()
+    delay = initial
+
+    while True:
+        status = await task.status()
+        print(f"  Status: {status.status} ({datetime.now().isoformat()})")
+
+        # Check if task reached a terminal state
+        if status.status in TERMINAL_STATES:
+            return status
+
+        if max_total_wait is not None:
+            remaining = max_total_wait - (time.monotonic() - start)
+            if remaining <= 0:
+                raise TimeoutError(f"Task did not complete within {max_total_wait}s")
+            delay = min(delay, remaining)
+
+        # Back off before polling again
+        await asyncio.sleep(delay)
+        delay = min(delay * factor, cap)
+
 
 async def pattern_1_direct_await(client: Client):
     """
@@ -46,18 +99,9 @@ async def pattern_2_status_polling(client: Client):
     )
     print(f"Task created: {task}")
 
-    # Poll status periodically
+    # Poll status with exponential backoff
     print("Polling task status...")
-    while True:
-        status = await task.status()
-        print(f"  Status: {status.status} ({datetime.now().isoformat()})")
-
-        # Check if task reached a terminal state
-        if status.status in ["completed", "failed", "cancelled"]:
-            break
-
-        # Wait a bit before polling again
-        await asyncio.sleep(1)
+    await _poll_until_terminal(task, max_total_wait=60.0)
 
     # Get the result
     result = await task.result()
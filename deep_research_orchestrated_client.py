@@ -17,7 +17,7 @@ But uses MCP background tasks instead!
 
 import asyncio
 import logging
-from datetime import datetime
+import time
 
 from fastmcp import Client
 
@@ -34,99 +34,109 @@ logging.basicConfig(
 logger = logging.getLogger("deep-research-client")
 
 
-async def orchestrated_deep_research(query: str):
+async def _with_index(index: int, awaitable):
+    """Await `awaitable` and return its result tagged with `index`."""
+    return index, await awaitable
+
+
+async def orchestrated_deep_research(client: Client, query: str):
     """
     Orchestrate deep research using composable MCP tasks.
 
     This demonstrates task composition - the pattern from pydantic_ai
     but using MCP background tasks instead of asyncio.TaskGroup!
     """
-    start_time = datetime.now()
+    start_time = time.monotonic()
     logger.info("=" * 80)
     logger.info(f"Starting deep research for: '{query}'")
     logger.info("=" * 80)
 
     print(f"\nQuery: {query}\n")
 
-    client = Client(mcp)
-    enable_task_polling_logs(client)
+    # Step 1: Create research plan
+    logger.info("STEP 1: Creating research plan...")
+    print("Creating research plan...")
+
+    step_start = time.monotonic()
+    plan_result = await client.call_tool("plan_research", {"query": query})
+    plan = plan_result.data
+    search_steps = plan['search_steps']
+    analysis_instructions = plan['analysis_instructions']
+    step_duration = time.monotonic() - step_start
+
+    logger.info(f"✓ Plan created in {step_duration:.1f}s")
+    logger.info(f"  - {len(search_steps)} search steps planned")
+    logger.info(f"  - Executive summary: {plan['executive_summary'][:80]}...")
+    print(f"✓ Plan created with {len(search_steps)} search steps\n")
+
+    # Step 2: Launch parallel search tasks (like pydantic_ai TaskGroup)
+    logger.info(f"STEP 2: Launching {len(search_steps)} parallel search tasks...")
+    print(f"Launching {len(search_steps)} search tasks in parallel...")
+
+    for i, step in enumerate(search_steps, 1):
+        logger.info(f"  Task {i}: '{step}'")
+
+    step_start = time.monotonic()
+    # Submit all searches concurrently rather than one round-trip at a time
+    search_tasks = await asyncio.gather(*[
+        client.call_tool("web_search", {"search_terms": step}, task=True)
+        for step in search_steps
+    ])
+    logger.info(f"✓ {len(search_tasks)} tasks launched")
+    print(f"✓ {len(search_tasks)} tasks running\n")
+
+    # Gather results
+    logger.info("Waiting for all search tasks to complete...")
+    print("Waiting for searches to complete...")
+
+    # Handle each search as soon as it finishes, keeping plan order for analysis
+    search_outputs = [None] * len(search_tasks)
+    for next_result in asyncio.as_completed(
+        [_with_index(i, search_task) for i, search_task in enumerate(search_tasks)]
+    ):
+        i, result = await next_result
+        search_outputs[i] = result.data
+        elapsed = time.monotonic() - step_start
+        logger.info(f"  Result {i + 1}: {len(result.data)} chars (after {elapsed:.1f}s)")
+        print(f"  ✓ Search {i + 1} done")
+    step_duration = time.monotonic() - step_start
+
+    logger.info(f"✓ All {len(search_outputs)} searches completed in {step_duration:.1f}s")
+    print(f"✓ Collected {len(search_outputs)} results\n")
+
+    # Step 3: Analyze results
+    logger.info("STEP 3: Analyzing combined search results...")
+    print("Analyzing results...")
+
+    step_start = time.monotonic()
+    analysis_task = await client.call_tool(
+        "analyze_research",
+        {
+            "query": query,
+            "search_results": search_outputs,
+            "instructions": analysis_instructions,
+        },
+        task=True,
+    )
+    logger.info("Analysis task launched, waiting for completion...")
+
+    analysis_result = await analysis_task
+    report = analysis_result.data
+    step_duration = time.monotonic() - step_start
+
+    total_duration = time.monotonic() - start_time
+
+    logger.info(f"✓ Analysis completed in {step_duration:.1f}s")
+    logger.info(f"Report length: {len(report)} chars")
+    logger.info("=" * 80)
+    logger.info(f"TOTAL RESEARCH TIME: {total_duration:.1f}s")
+    logger.info("=" * 80)
 
-    async with client:
-        # Step 1: Create research plan
-        logger.info("STEP 1: Creating research plan...")
-        print("Creating research plan...")
-
-        step_start = datetime.now()
-        plan_result = await client.call_tool("plan_research", {"query": query})
-        plan = plan_result.data
-        step_duration = (datetime.now() - step_start).total_seconds()
-
-        logger.info(f"✓ Plan created in {step_duration:.1f}s")
-        logger.info(f"  - {len(plan['search_steps'])} search steps planned")
-        logger.info(f"  - Executive summary: {plan['executive_summary'][:80]}...")
-        print(f"✓ Plan created with {len(plan['search_steps'])} search steps\n")
-
-        # Step 2: Launch parallel search tasks (like pydantic_ai TaskGroup)
-        logger.info(f"STEP 2: Launching {len(plan['search_steps'])} parallel search tasks...")
-        print(f"Launching {len(plan['search_steps'])} search tasks in parallel...")
-
-        for i, step in enumerate(plan['search_steps'], 1):
-            logger.info(f"  Task {i}: '{step}'")
-
-        step_start = datetime.now()
-        search_tasks = [
-            await client.call_tool("web_search", {"search_terms": step}, task=True)
-            for step in plan['search_steps']
-        ]
-        logger.info(f"✓ {len(search_tasks)} tasks launched")
-        print(f"✓ {len(search_tasks)} tasks running\n")
-
-        # Gather results
-        logger.info("Waiting for all search tasks to complete...")
-        print("Waiting for searches to complete...")
-
-        search_results = await asyncio.gather(*search_tasks)
-        search_outputs = [result.data for result in search_results]
-        step_duration = (datetime.now() - step_start).total_seconds()
-
-        logger.info(f"✓ All {len(search_outputs)} searches completed in {step_duration:.1f}s")
-        for i, output in enumerate(search_outputs, 1):
-            logger.info(f"  Result {i}: {len(output)} chars")
-        print(f"✓ Collected {len(search_outputs)} results\n")
-
-        # Step 3: Analyze results
-        logger.info("STEP 3: Analyzing combined search results...")
-        print("Analyzing results...")
-
-        step_start = datetime.now()
-        analysis_task = await client.call_tool(
-            "analyze_research",
-            {
-                "query": query,
-                "search_results": search_outputs,
-                "instructions": plan['analysis_instructions'],
-            },
-            task=True,
-        )
-        logger.info("Analysis task launched, waiting for completion...")
-
-        analysis_result = await analysis_task
-        report = analysis_result.data
-        step_duration = (datetime.now() - step_start).total_seconds()
-
-        total_duration = (datetime.now() - start_time).total_seconds()
-
-        logger.info(f"✓ Analysis completed in {step_duration:.1f}s")
-        logger.info(f"Report length: {len(report)} chars")
-        logger.info("=" * 80)
-        logger.info(f"TOTAL RESEARCH TIME: {total_duration:.1f}s")
-        logger.info("=" * 80)
-
-        print("\n" + "=" * 80)
-        print("RESEARCH REPORT")
-        print("=" * 80)
-        print(report)
-        print("=" * 80)
+    print("\n" + "=" * 80)
+    print("RESEARCH REPORT")
+    print("=" * 80)
+    print(report)
+    print("=" * 80)
 
 
 async def main():
@@ -141,7 +151,12 @@ async def main():
     print("Deep Research: Task Composition Demo")
     print("=" * 80)
 
-    await orchestrated_deep_research(query)
+    # One client session is shared by every step of the pipeline
+    client = Client(mcp)
+    enable_task_polling_logs(client)
+
+    async with client:
+        await orchestrated_deep_research(client, query)
 
     logger.info("\nDemo completed successfully!")
 
@@ -9,6 +9,7 @@ Requires .env file with API keys.
 """
 
 import asyncio
+import time
 from datetime import datetime
 
 from fastmcp import Client
@@ -57,22 +58,27 @@ async def demonstrate_real_research():
 
         # Monitor progress
         check_count = 0
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
+
+        # Check often at first, then back off while the task keeps running -
+        # one status request per check, however long the research takes
+        delay = 5.0
 
         while True:
             check_count += 1
             status = await task.status()
 
-            elapsed = (datetime.now() - start_time).total_seconds()
-            timestamp = datetime.now().strftime('%H:%M:%S')
-
-            print(f"[{timestamp}] Check #{check_count} (elapsed: {elapsed:.0f}s): Status = {status.status}")
+            elapsed = (time.monotonic_ns() - start_ns) / 1e9
+            print(
+                f"[{datetime.now().strftime('%H:%M:%S')}] Check #{check_count} "
+                f"(elapsed: {elapsed:.0f}s): Status = {status.status}"
+            )
 
             if status.status in ["completed", "failed", "cancelled"]:
                 break
 
-            # Check every 5 seconds for real tasks (they take longer)
-            await asyncio.sleep(5)
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 60.0)
 
         # Get result
         print("\n" + "=" * 70)
@@ -86,7 +92,7 @@ async def demonstrate_real_research():
             return
 
         print(f"\n✓ Total checks: {check_count}")
-        print(f"✓ Total time: {(datetime.now() - start_time).total_seconds():.1f}s")
+        print(f"✓ Total time: {(time.monotonic_ns() - start_ns) / 1e9:.1f}s")
         print(f"✓ Agents used: {', '.join(result.data['metadata']['agents_used'])}")
 
         print("\n" + "=" * 70)
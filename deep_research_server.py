@@ -16,28 +16,54 @@ Based on: https://ai.pydantic.dev/examples/deep-research/
 """
 
 import asyncio
+import atexit
+import hashlib
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import time
 import warnings
-from typing import Annotated, Optional
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Literal, Optional
+from xml.sax.saxutils import escape
 
+import httpx
 from annotated_types import MaxLen
 from dotenv import load_dotenv
-from fastmcp import FastMCP, settings as fastmcp_settings
+from fastmcp import FastMCP
 from pydantic import BaseModel, ConfigDict, Field
-from pydantic_ai import Agent, RunContext, WebSearchTool, format_as_xml
+from pydantic_ai import Agent, RunContext, WebSearchTool
 from pydantic_ai.agent import AbstractAgent
+from pydantic_ai.models.anthropic import AnthropicModel
+from pydantic_ai.models.google import GoogleModel
+from pydantic_ai.providers.anthropic import AnthropicProvider
+from pydantic_ai.providers.google import GoogleProvider
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+import event_loop
+
 # Load environment variables from .env file FIRST
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
+# Configure logging. Tools only enqueue records; a background thread writes
+# them to stderr, so concurrent tasks never block the event loop on console I/O.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter(
+    fmt='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
     datefmt='%H:%M:%S'
-)
+))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_log_enqueue = logging.handlers.QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter('%(message)s'))  # Full format is applied by _log_stream
+logging.basicConfig(level=logging.INFO, handlers=[_log_enqueue])
 logger = logging.getLogger("deep-research-server")
 
 # Suppress pydantic_ai deprecation warnings
@@ -68,12 +94,72 @@ class Settings(BaseSettings):
         description="Direct Gemini API key",
     )
 
+    # Models - pinned to dated snapshots so results don't shift under us
+    claude_model: str = Field(
+        "claude-sonnet-4-5-20250929",
+        description="Anthropic model used for planning and analysis",
+    )
+    gemini_model: str = Field(
+        "gemini-2.5-flash",
+        description="Gemini model used for web searches",
+    )
+
     # Optional (if using Vertex AI instead)
     google_vertex_project: Optional[str] = Field(
         None,
         description="Google Cloud project ID for Vertex AI (not needed if using direct Gemini API)",
     )
 
+    # Tuning
+    max_search_steps: int = Field(
+        8,
+        description="Upper bound on web searches per research plan",
+    )
+    http_max_connections: int = Field(
+        200,
+        description="Connection pool size shared by all model providers",
+    )
+    http_max_keepalive_connections: int = Field(
+        100,
+        description="Idle connections kept open for reuse across agent calls",
+    )
+    max_concurrent_research: int = Field(
+        4,
+        description="deep_research runs allowed at once; extra runs wait for a slot",
+    )
+    max_concurrent_search: int = Field(
+        10,
+        description="Search agent calls allowed at once across all tasks",
+    )
+    research_cache_ttl: float = Field(
+        3600,
+        description="Seconds a finished deep_research report is reused for the same query",
+    )
+    agent_cache_size: int = Field(
+        256,
+        description="Number of plan/search agent results to keep in memory",
+    )
+    agent_cache_ttl: float = Field(
+        3600,
+        description="Seconds a finished plan/search/summary agent result is reused for the same prompt",
+    )
+    max_extra_searches: int = Field(
+        3,
+        description="Extra searches the analysis agent may run per report",
+    )
+    summarize_search_results: bool = Field(
+        True,
+        description="Condense each search report before analysis, so the analysis prompt stays small",
+    )
+    summary_max_tokens: int = Field(
+        400,
+        description="Output token limit for each condensed search report",
+    )
+    analysis_format: Literal["json", "xml"] = Field(
+        "json",
+        description="Encoding of the analysis agent's input; compact JSON uses fewer tokens than XML",
+    )
+
 
 # Load settings from .env
 try:
@@ -88,14 +174,38 @@ except Exception as e:
     print("\n   Or use: deep_research_mock_server.py (no API keys required)\n")
     exit(1)
 
-# Enable experimental task support
-fastmcp_settings.experimental.enable_docket = True
-fastmcp_settings.experimental.enable_tasks = True
+# Model API hosts to open pooled connections to at startup
+_PROVIDER_URLS = (
+    "https://api.anthropic.com",
+    "https://generativelanguage.googleapis.com",
+)
+
+
+async def _warm_up_providers() -> None:
+    """Resolve DNS and complete TLS to each model API so the first task doesn't pay for it."""
+    responses = await asyncio.gather(
+        *(http_client.head(url) for url in _PROVIDER_URLS), return_exceptions=True
+    )
+    for url, response in zip(_PROVIDER_URLS, responses):
+        if isinstance(response, Exception):
+            logger.warning("Could not warm up connection to %s: %s", url, response)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Warm up provider connections in the background while the server starts."""
+    warm_up = asyncio.create_task(_warm_up_providers())
+    try:
+        yield {}
+    finally:
+        warm_up.cancel()
+
 
 # Create the FastMCP server
 mcp = FastMCP(
     name="deep-research-server",
     instructions="Deep research server using AI agents for comprehensive analysis",
+    lifespan=lifespan,
 )
 
 
@@ -104,6 +214,27 @@ mcp = FastMCP(
 # ============================================================================
 
 
+# One connection pool shared by every agent, so concurrent tasks reuse warm
+# TLS connections instead of each provider keeping its own default-sized pool.
+# It lives for the whole process, like pydantic-ai's own cached clients.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+    ),
+    timeout=httpx.Timeout(600, connect=5),
+)
+
+claude_model = AnthropicModel(
+    settings.claude_model,
+    provider=AnthropicProvider(api_key=settings.anthropic_api_key, http_client=http_client),
+)
+gemini_model = GoogleModel(
+    settings.gemini_model,
+    provider=GoogleProvider(api_key=settings.gemini_api_key, http_client=http_client),
+)
+
+
 class WebSearchStep(BaseModel):
     """A step that performs a web search."""
 
@@ -116,16 +247,45 @@ class DeepResearchPlan(BaseModel, **ConfigDict(use_attribute_docstrings=True)):
     executive_summary: str
     """A summary of the research plan."""
 
-    web_search_steps: Annotated[list[WebSearchStep], MaxLen(5)]
+    estimated_complexity: Literal["low", "medium", "high"]
+    """How much searching the query needs: low for narrow factual questions, high for broad or open-ended topics."""
+
+    web_search_steps: Annotated[list[WebSearchStep], MaxLen(settings.max_search_steps)]
     """A list of web search steps to perform to gather raw information."""
 
     analysis_instructions: str
     """The analysis step to perform after all web search steps are completed."""
 
 
+# Searches allowed for each complexity estimate (further capped by max_search_steps)
+_SEARCH_BUDGET = {"low": 2, "medium": 4, "high": 8}
+
+
+def _budgeted_steps(plan: DeepResearchPlan) -> list[WebSearchStep]:
+    """Trim a plan's search steps to the budget for its estimated complexity."""
+    budget = min(_SEARCH_BUDGET[plan.estimated_complexity], settings.max_search_steps)
+    return plan.web_search_steps[:budget]
+
+
+def _search_key(search_terms: str) -> str:
+    """Normalize search terms so case and whitespace variants count as the same search."""
+    return " ".join(search_terms.split()).lower()
+
+
+@dataclass
+class SearchState:
+    """Extra-search budget for one analysis run, passed to the agent as deps."""
+
+    calls_remaining: int
+    """Extra searches still allowed."""
+
+    seen: dict[str, str] = field(default_factory=dict)
+    """Results already gathered, keyed by _search_key(search_terms)."""
+
+
 # Planning agent - creates research plan
 plan_agent = Agent(
-    "anthropic:claude-sonnet-4-5",
+    claude_model,
     instructions="Analyze the users query and design a plan for deep research to answer their query.",
     output_type=DeepResearchPlan,
     name="abstract_plan_agent",
@@ -133,19 +293,33 @@ plan_agent = Agent(
 
 # Search agent - performs web searches
 search_agent = Agent(
-    "google-gla:gemini-2.5-flash",
+    gemini_model,
     instructions="Perform a web search for the given terms and return a detailed report on the results.",
     builtin_tools=[WebSearchTool()],
     name="search_agent",
 )
 
+# Summary agent - condenses each search report before analysis
+summary_agent = Agent(
+    gemini_model,
+    instructions=(
+        "Condense the search report into the facts relevant to the given research query. "
+        "Drop boilerplate and duplicated snippets; keep figures, dates, names and sources."
+    ),
+    model_settings={"max_tokens": settings.summary_max_tokens},
+    name="summary_agent",
+)
+
 # Analysis agent - synthesizes findings
 analysis_agent = Agent(
-    "anthropic:claude-sonnet-4-5",
-    deps_type=AbstractAgent,
-    instructions="""
+    claude_model,
+    deps_type=SearchState,
+    instructions=f"""
 Analyze the research from the previous steps and generate a report on the given subject.
 
+The input is {"a JSON object" if settings.analysis_format == "json" else "XML"} with the research `query`, the
+`search_results` from the previous steps, and the analysis `instructions` to follow.
+
 If the search results do not contain enough information, you may perform further searches using the
 `extra_search` tool.
 """,
@@ -153,12 +327,171 @@ If the search results do not contain enough information, you may perform further
 )
 
 
+# ============================================================================
+# Shared result cache
+# ============================================================================
+
+
+# Per namespace: results keyed by digest, as (future, completed_at).
+# completed_at is None while the call is still in flight.
+_shared_results: dict[str, dict[bytes, tuple[asyncio.Future, float | None]]] = {}
+
+
+def _evict(
+    entries: dict[bytes, tuple[asyncio.Future, float | None]],
+    ttl: float,
+    max_entries: int | None,
+) -> None:
+    """
+    Drop expired results, then the oldest finished ones while over size.
+
+    In-flight calls are never evicted, so concurrent duplicates keep sharing them.
+    """
+    now = time.monotonic()
+    for key, (_, completed_at) in list(entries.items()):
+        if completed_at is None:
+            continue
+        expired = now - completed_at >= ttl
+        if expired or (max_entries is not None and len(entries) > max_entries):
+            del entries[key]
+
+
+async def shared_call(
+    namespace: str,
+    key: bytes,
+    call: Callable[[], Awaitable[Any]],
+    *,
+    ttl: float,
+    max_entries: int | None = None,
+    label: str,
+    subject: str,
+) -> Any:
+    """
+    Await `call()`, sharing its result with identical requests.
+
+    Callers that arrive while a call is in flight join it instead of starting
+    another, and a finished result is reused for `ttl` seconds. Failed calls
+    are not kept. Each namespace has its own entries, expiry and size bound.
+
+    Args:
+        namespace: Which cache the entry belongs to
+        key: Digest identifying the request within the namespace
+        call: Starts the work on a cache miss
+        ttl: Seconds a finished result is reused
+        max_entries: Finished results kept in the namespace (None for no bound)
+        label: What is being reused, for the log line on a hit
+        subject: The request being reused, for the log line on a hit (truncated)
+
+    Returns:
+        The call's result
+    """
+    entries = _shared_results.setdefault(namespace, {})
+    entry = entries.get(key)
+    if entry is not None and entry[1] is not None and time.monotonic() - entry[1] >= ttl:
+        del entries[key]
+        entry = None
+
+    if entry is None:
+        future = asyncio.ensure_future(call())
+        entries[key] = (future, None)
+
+        def _on_done(fut: asyncio.Future) -> None:
+            current = entries.get(key)
+            if current is None or current[0] is not fut:
+                return
+            if fut.cancelled() or fut.exception() is not None:
+                del entries[key]
+            else:
+                entries[key] = (fut, time.monotonic())
+
+        future.add_done_callback(_on_done)
+        _evict(entries, ttl, max_entries)
+    else:
+        future = entry[0]
+        # Subjects can be whole search reports, so only log the start
+        logger.info("Reusing %s for %.80r", label, subject)
+
+    # Shield so one cancelled caller doesn't cancel the call for everyone else
+    return await asyncio.shield(future)
+
+
+async def cached_run(agent: AbstractAgent, prompt: str, slots: asyncio.Semaphore | None = None):
+    """
+    Run an agent, reusing the result of a recent or in-flight identical run.
+
+    Results are keyed on the agent name and prompt, so concurrent duplicate
+    requests share a single model call. Results expire after agent_cache_ttl,
+    and failed runs are not cached. With `slots`, a model call waits for a free
+    slot; cache hits and callers joining an in-flight run never take one.
+    """
+    key = hashlib.blake2b(f"{agent.name}|{prompt}".encode(), digest_size=16).digest()
+
+    async def call():
+        if slots is None:
+            return await agent.run(prompt)
+        async with slots:
+            return await agent.run(prompt)
+
+    return await shared_call(
+        "agent",
+        key,
+        call,
+        ttl=settings.agent_cache_ttl,
+        max_entries=settings.agent_cache_size,
+        label=f"cached {agent.name} result",
+        subject=prompt,
+    )
+
+
+# Caps on concurrent work, so a burst of tasks queues instead of tripping
+# provider rate limits or holding every report in memory at once
+_research_slots = asyncio.Semaphore(settings.max_concurrent_research)
+_search_slots = asyncio.Semaphore(settings.max_concurrent_search)
+
+
+async def run_search(agent: AbstractAgent, search_terms: str):
+    """Run a search agent (cached), taking a search slot only for a real model call."""
+    return await cached_run(agent, search_terms, slots=_search_slots)
+
+
+async def search_for_analysis(query: str, search_terms: str) -> str:
+    """
+    Run a search and condense its report for analysis of `query`.
+
+    The summary is chained onto each search, so it overlaps with the searches
+    still running instead of adding a step before analysis.
+    """
+    result = await run_search(search_agent, search_terms)
+    if not settings.summarize_search_results:
+        return result.output
+
+    summary = await cached_run(
+        summary_agent, f"Summarize for analysis of: {query}\n\n{result.output}"
+    )
+    logger.info(
+        "Condensed search %r: %d -> %d chars", search_terms, len(result.output), len(summary.output)
+    )
+    return summary.output
+
+
 @analysis_agent.tool
-async def extra_search(ctx: RunContext[AbstractAgent], query: str) -> str:
+async def extra_search(ctx: RunContext[SearchState], query: str) -> str:
     """Perform an extra search for the given query."""
-    logger.info(f"Analysis agent requesting extra search: '{query}'")
-    result = await ctx.deps.run(query)
-    logger.info(f"Extra search completed: '{query}' ({len(result.output)} chars)")
+    state = ctx.deps
+    key = _search_key(query)
+
+    if key in state.seen:
+        logger.info("Extra search already done: %r", query)
+        return state.seen[key]
+    if state.calls_remaining <= 0:
+        logger.info("Extra search budget exhausted, skipping: %r", query)
+        return "No more searches are available. Write the report from the results you already have."
+
+    state.calls_remaining -= 1
+    logger.info("Analysis agent requesting extra search: %r (%d left)", query, state.calls_remaining)
+    result = await run_search(search_agent, query)
+    state.seen[key] = result.output
+    logger.info("Extra search completed: %r (%d chars)", query, len(result.output))
     return result.output
 
 
@@ -175,9 +508,9 @@ async def web_search(search_terms: str) -> str:
     Returns:
         str: Detailed report on search results
     """
-    logger.info(f"Starting web search: '{search_terms}'")
-    result = await search_agent.run(search_terms)
-    logger.info(f"Web search completed: '{search_terms}' ({len(result.output)} chars)")
+    logger.info("Starting web search: %r", search_terms)
+    result = await run_search(search_agent, search_terms)
+    logger.info("Web search completed: %r (%d chars)", search_terms, len(result.output))
     return result.output
 
 
@@ -202,23 +535,51 @@ async def plan_research(query: str) -> dict:
     Returns:
         dict: Research plan with search_steps list and analysis_instructions
     """
-    logger.info(f"Creating research plan for query: '{query}'")
-    result = await plan_agent.run(query)
+    logger.info("Creating research plan for query: %r", query)
+    result = await cached_run(plan_agent, query)
     plan = result.output
 
-    logger.info(f"Plan created: {len(plan.web_search_steps)} search steps")
-    logger.info(f"Executive summary: {plan.executive_summary[:100]}...")
+    steps = _budgeted_steps(plan)
 
-    for i, step in enumerate(plan.web_search_steps, 1):
-        logger.info(f"  Step {i}: {step.search_terms}")
+    logger.info("Plan created: %d search steps (%s complexity)", len(steps), plan.estimated_complexity)
+    logger.info("Executive summary: %.100s...", plan.executive_summary)
+
+    if logger.isEnabledFor(logging.INFO):
+        for i, step in enumerate(steps, 1):
+            logger.info("  Step %d: %s", i, step.search_terms)
 
     return {
         "executive_summary": plan.executive_summary,
-        "search_steps": [step.search_terms for step in plan.web_search_steps],
+        "search_steps": [step.search_terms for step in steps],
         "analysis_instructions": plan.analysis_instructions,
     }
 
 
+# Same layout format_as_xml produces for the analysis input, filled in directly
+_ANALYSIS_TEMPLATE = (
+    "<query>{query}</query>\n"
+    "<search_results>\n{results}\n</search_results>\n"
+    "<instructions>{instructions}</instructions>"
+)
+_RESULT_TEMPLATE = "  <item>{}</item>"
+
+
+def _build_analysis_prompt(query: str, search_results: list[str], instructions: str) -> str:
+    """Render the analysis agent's input from the query, results and instructions."""
+    if settings.analysis_format == "json":
+        # No indentation or markup around each result, so fewer input tokens
+        return json.dumps(
+            {"query": query, "search_results": search_results, "instructions": instructions},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    return _ANALYSIS_TEMPLATE.format(
+        query=escape(query),
+        results="\n".join(_RESULT_TEMPLATE.format(escape(result)) for result in search_results),
+        instructions=escape(instructions),
+    )
+
+
 @mcp.tool(task=True)
 async def analyze_research(query: str, search_results: list[str], instructions: str) -> str:
     """
@@ -234,24 +595,122 @@ async def analyze_research(query: str, search_results: list[str], instructions:
     Returns:
         str: Final research report
     """
-    logger.info(f"Starting analysis for query: '{query}'")
-    logger.info(f"Analyzing {len(search_results)} search results")
-
-    analysis_result = await analysis_agent.run(
-        format_as_xml(
-            {
-                "query": query,
-                "search_results": search_results,
-                "instructions": instructions,
-            }
-        ),
-        deps=search_agent,
-    )
+    logger.info("Starting analysis for query: %r", query)
+    logger.info("Analyzing %d search results", len(search_results))
 
-    logger.info(f"Analysis completed ({len(analysis_result.output)} chars)")
+    # Search results can be large, so encode them off the event loop
+    prompt = await asyncio.to_thread(_build_analysis_prompt, query, search_results, instructions)
+    state = SearchState(calls_remaining=settings.max_extra_searches)
+    analysis_result = await analysis_agent.run(prompt, deps=state)
+
+    logger.info("Analysis completed (%d chars)", len(analysis_result.output))
     return analysis_result.output
 
 
+# ============================================================================
+# FastMCP Tool - Monolithic Research Pipeline
+# ============================================================================
+#
+# The same pipeline as above, run end-to-end inside one background task for
+# clients that just want a report (see deep_research_real_client.py).
+
+
+async def run_deep_research(query: str) -> str:
+    """
+    Plan, search in parallel, and analyze - the original pydantic_ai example flow.
+
+    Args:
+        query: The research question
+
+    Returns:
+        str: Final research report
+    """
+    async with _research_slots:
+        logger.info("Starting deep research for: %r", query)
+        plan = (await cached_run(plan_agent, query)).output
+        steps = _budgeted_steps(plan)
+        logger.info("Plan created: %d search steps (%s complexity)", len(steps), plan.estimated_complexity)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(search_for_analysis(query, step.search_terms))
+                for step in steps
+            ]
+        search_results = [task.result() for task in tasks]
+        logger.info("All %d searches completed", len(search_results))
+
+        prompt = await asyncio.to_thread(
+            _build_analysis_prompt, query, search_results, plan.analysis_instructions
+        )
+        # Planned searches count as seen, so the agent can't repeat them as extra searches
+        state = SearchState(
+            calls_remaining=settings.max_extra_searches,
+            seen={
+                _search_key(step.search_terms): result
+                for step, result in zip(steps, search_results)
+            },
+        )
+        analysis_result = await analysis_agent.run(prompt, deps=state)
+
+        logger.info("Deep research completed (%d chars)", len(analysis_result.output))
+        return analysis_result.output
+
+
+def _research_key(query: str) -> bytes:
+    """Key a query so that case and whitespace differences hit the same cache entry."""
+    canonical = " ".join(query.split()).lower()
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+
+async def cached_deep_research(query: str) -> str:
+    """
+    Run deep research, reusing a recent report or an in-flight run for the same query.
+
+    Args:
+        query: The research question
+
+    Returns:
+        str: Final research report
+    """
+    return await shared_call(
+        "deep_research",
+        _research_key(query),
+        lambda: run_deep_research(query),
+        ttl=settings.research_cache_ttl,
+        label="deep_research report",
+        subject=query,
+    )
+
+
+@mcp.tool(task=True)
+async def deep_research(query: str) -> dict:
+    """
+    Run the complete research pipeline as a single background task.
+
+    Takes 10-30 minutes depending on query complexity and API response times.
+
+    Args:
+        query: The research question
+
+    Returns:
+        dict: The query, the final report, and metadata about the run
+    """
+    report = await cached_deep_research(query)
+
+    agents_used = [plan_agent.name, search_agent.name]
+    if settings.summarize_search_results:
+        agents_used.append(summary_agent.name)
+    agents_used.append(analysis_agent.name)
+
+    return {
+        "query": query,
+        "report": report,
+        "metadata": {
+            "agents_used": agents_used,
+        },
+    }
+
+
 if __name__ == "__main__":
     # Settings already validated when loaded from .env above
-    mcp.run(transport="stdio")
+    event_loop.run(mcp.run_async(transport="stdio"))
@@ -1,25 +1,20 @@
 """
 Standalone demo of FastMCP background tasks (SEP-1686)
 
-This script demonstrates TRUE concurrent task execution using the sep-1686 branch.
+This script demonstrates TRUE concurrent task execution with FastMCP 2.14+.
 
-IMPORTANT: You must enable experimental settings for concurrent execution:
-    settings.experimental.enable_docket = True
-    settings.experimental.enable_tasks = True
-
-With these enabled, tasks run concurrently! Example 2 shows 3 tasks completing
-in ~3 seconds total (not 6s), proving concurrent execution works.
+Tools declared with task=True run in the background, so tasks run concurrently!
+Example 2 shows 3 tasks completing in ~3 seconds total (not 6s), proving
+concurrent execution works.
 """
 
 import asyncio
 import time
 from datetime import datetime
 
-from fastmcp import Client, FastMCP, settings
+from fastmcp import Client, FastMCP
 
-# Enable experimental task support
-settings.experimental.enable_docket = True
-settings.experimental.enable_tasks = True
+import event_loop
 
 # Create the server
 server = FastMCP(name="demo-server")
@@ -37,12 +32,13 @@ async def long_running_task(duration: int, task_name: str) -> dict:
     Returns:
         Results of the task execution
     """
-    start = time.time()
+    loop = asyncio.get_running_loop()
+    start = loop.time()  # Monotonic, unaffected by wall-clock changes
     print(f"  [SERVER] Task '{task_name}' starting, will run for {duration}s")
 
     await asyncio.sleep(duration)  # Non-blocking async sleep
 
-    elapsed = time.time() - start
+    elapsed = loop.time() - start
     print(f"  [SERVER] Task '{task_name}' completed after {elapsed:.2f}s")
 
     return {
@@ -60,240 +56,254 @@ def instant_tool(message: str) -> str:
     return f"Instant response: {message}"
 
 
-async def run_demo():
-    """Run the complete demo showing task lifecycle"""
-    print("=" * 60)
-    print("FastMCP Background Tasks Demo (SEP-1686)")
-    print("=" * 60)
-
-    # Create client connected to our server
-    client = Client(server)
-
-    async with client:
-        print(f"\nConnected to server: {server.name}\n")
-
-        # Example 0: COMPARISON - Three Different Approaches
-        print("=" * 70)
-        print("COMPARISON: Three Ways to Call Multiple Tools")
-        print("=" * 70)
-
-        # Part A: Sequential (await each call one by one)
-        print("\nApproach A: Sequential calls (one at a time)")
-        print("-" * 70)
-        sequential_start = time.time()
-
-        print("[CLIENT] Calling 3 tools sequentially...")
-        result1 = await client.call_tool(
-            "long_running_task",
-            {"duration": 3, "task_name": "sequential-A"},
-            task=False,
-        )
-        result2 = await client.call_tool(
-            "long_running_task",
-            {"duration": 2, "task_name": "sequential-B"},
-            task=False,
-        )
-        result3 = await client.call_tool(
-            "long_running_task",
-            {"duration": 1, "task_name": "sequential-C"},
-            task=False,
+# (suffix, duration) for the three calls each comparison approach makes
+COMPARISON_RUNS = (("A", 3), ("B", 2), ("C", 1))
+
+
+def comparison_payloads(prefix: str) -> list[dict]:
+    """Build the long_running_task arguments for one comparison approach."""
+    return [
+        {"duration": duration, "task_name": f"{prefix}-{suffix}"}
+        for suffix, duration in COMPARISON_RUNS
+    ]
+
+
+async def call_sequentially(client: Client, payloads: list[dict]) -> list:
+    """Approach A: await each call before making the next."""
+    print("[CLIENT] Calling 3 tools sequentially...")
+    return [
+        await client.call_tool("long_running_task", payload, task=False)
+        for payload in payloads
+    ]
+
+
+async def call_with_gather(client: Client, payloads: list[dict]) -> list:
+    """Approach B: run regular (non-task) calls concurrently with asyncio.gather."""
+    print("[CLIENT] Using asyncio.gather on regular tool calls...")
+    return await asyncio.gather(*(
+        client.call_tool("long_running_task", payload, task=False)
+        for payload in payloads
+    ))
+
+
+async def call_as_background_tasks(client: Client, payloads: list[dict]) -> list:
+    """Approach C: submit background tasks, then wait for all of their results."""
+    print("[CLIENT] Launching background tasks...")
+    # Submit all three at once; if any submission fails the others are cancelled
+    async with asyncio.TaskGroup() as tg:
+        submissions = [
+            tg.create_task(client.call_tool("long_running_task", payload, task=True))
+            for payload in payloads
+        ]
+    background_tasks = [submission.result() for submission in submissions]
+
+    print("[CLIENT] Tasks launched, waiting for completion...")
+    try:
+        async with asyncio.TaskGroup() as tg:
+            waits = [tg.create_task(task.result()) for task in background_tasks]
+    except ExceptionGroup:
+        # The group only stopped waiting on the other tasks - cancel them
+        # on the server too, so they don't keep running for nothing
+        await asyncio.gather(
+            *(task.cancel() for task, wait in zip(background_tasks, waits) if wait.cancelled()),
+            return_exceptions=True,
         )
+        raise
+    return [wait.result() for wait in waits]
 
-        sequential_elapsed = time.time() - sequential_start
-        print(f"[CLIENT] ⏱️  Sequential took: {sequential_elapsed:.2f}s\n")
 
-        # Part B: asyncio.gather with task=False
-        print("Approach B: asyncio.gather with task=False")
-        print("-" * 70)
-        gather_start = time.time()
+# (heading, label, task name prefix, runner) for each comparison approach;
+# the first one is the baseline the others are measured against
+COMPARISON_APPROACHES = (
+    ("Approach A: Sequential calls (one at a time)", "Sequential", "sequential", call_sequentially),
+    ("Approach B: asyncio.gather with task=False", "asyncio.gather", "gather", call_with_gather),
+    ("Approach C: Background tasks (task=True)", "Background tasks", "background", call_as_background_tasks),
+)
 
-        print("[CLIENT] Using asyncio.gather on regular tool calls...")
-        results = await asyncio.gather(
-            client.call_tool("long_running_task", {"duration": 3, "task_name": "gather-A"}, task=False),
-            client.call_tool("long_running_task", {"duration": 2, "task_name": "gather-B"}, task=False),
-            client.call_tool("long_running_task", {"duration": 1, "task_name": "gather-C"}, task=False),
-        )
-
-        gather_elapsed = time.time() - gather_start
-        print(f"[CLIENT] ⏱️  asyncio.gather took: {gather_elapsed:.2f}s\n")
-
-        # Part C: Background tasks (task=True)
-        print("Approach C: Background tasks (task=True)")
-        print("-" * 70)
-        task_start = time.time()
-
-        print("[CLIENT] Launching background tasks...")
-        task1 = await client.call_tool(
-            "long_running_task",
-            {"duration": 3, "task_name": "background-A"},
-            task=True,
-        )
-        task2 = await client.call_tool(
-            "long_running_task",
-            {"duration": 2, "task_name": "background-B"},
-            task=True,
-        )
-        task3 = await client.call_tool(
-            "long_running_task",
-            {"duration": 1, "task_name": "background-C"},
-            task=True,
-        )
-
-        print("[CLIENT] Tasks launched, waiting for completion...")
-        results = await asyncio.gather(task1, task2, task3)
-
-        task_elapsed = time.time() - task_start
-        print(f"[CLIENT] ⏱️  Background tasks took: {task_elapsed:.2f}s\n")
-
-        # Summary
-        print("=" * 70)
-        print("SUMMARY")
-        print("=" * 70)
-        print(f"Sequential:        {sequential_elapsed:.2f}s (baseline)")
-        print(f"asyncio.gather:    {gather_elapsed:.2f}s ({sequential_elapsed/gather_elapsed:.2f}x faster)")
-        print(f"Background tasks:  {task_elapsed:.2f}s ({sequential_elapsed/task_elapsed:.2f}x faster)")
-        print()
-        print("💡 Key insight: asyncio.gather ALSO gives you concurrency!")
-        print("   Both approaches run tasks in parallel with similar performance.")
-        print()
-        print("   So when should you use task=True? When you need:")
-        print("   - Status polling while tasks run")
-        print("   - Fire-and-forget (submit now, check later)")
-        print("   - Ability to do other work before checking results")
-        print()
-
-        # Show what you CAN'T do with asyncio.gather
-        print("Example: What tasks=True enables (impossible with asyncio.gather)")
-        print("-" * 70)
 
-        # Submit tasks
-        long_task = await client.call_tool(
-            "long_running_task",
-            {"duration": 5, "task_name": "long-running"},
-            task=True,
-        )
-        print("[CLIENT] Submitted long task (5s), doing other work...")
-
-        # Do other work while it runs!
-        for i in range(3):
-            await asyncio.sleep(1)
-            status = await long_task.status()
-            print(f"  [{i+1}s] Task status: {status.status} (still working...)")
-
-        # Get result when ready
-        print("[CLIENT] Now waiting for final result...")
-        result = await long_task.result()
-        print(f"[CLIENT] Got result: {result.data['message']}")
-        print()
-        print("⚠️  You can't poll status like this with asyncio.gather!")
-        print()
-
-        # Example 1: Simple task with direct await
-        print("Example 1: Call task and await immediately")
-        print("-" * 60)
-        task1 = await client.call_tool(
-            "long_running_task",
-            {"duration": 2, "task_name": "quick-task"},
-            task=True,
-        )
-        print(f"[CLIENT] Task object created: {type(task1).__name__}")
-        result1 = await task1
-        print(f"[CLIENT] Result: {result1.data}\n")
-
-        # Example 2: Multiple concurrent tasks
-        print("Example 2: Launch multiple tasks concurrently")
-        print("-" * 60)
-        start_time = time.time()
-        print(f"[CLIENT] Starting 3 tasks simultaneously at {datetime.now().strftime('%H:%M:%S')}...")
-
-        task_a = await client.call_tool(
-            "long_running_task",
-            {"duration": 3, "task_name": "task-A"},
-            task=True,
-        )
-        task_b = await client.call_tool(
-            "long_running_task",
-            {"duration": 2, "task_name": "task-B"},
-            task=True,
-        )
-        task_c = await client.call_tool(
-            "long_running_task",
-            {"duration": 1, "task_name": "task-C"},
-            task=True,
-        )
+async def run_demo(client: Client):
+    """
+    Run the complete demo showing task lifecycle.
 
-        print("[CLIENT] All tasks launched, waiting for completion...")
+    Args:
+        client: Connected client for `server`, shared by every example
+    """
+    print("=" * 60)
+    print("FastMCP Background Tasks Demo (SEP-1686)")
+    print("=" * 60)
 
-        # Gather results (they'll complete in different order based on duration)
-        results = await asyncio.gather(task_a, task_b, task_c)
+    print(f"\nConnected to server: {server.name}\n")
 
-        elapsed = time.time() - start_time
-        print(f"[CLIENT] All tasks completed in {elapsed:.2f}s (3+2+1=6s if serial, ~3s if concurrent)")
+    # Example 0: COMPARISON - Three Different Approaches
+    print("=" * 70)
+    print("COMPARISON: Three Ways to Call Multiple Tools")
+    print("=" * 70)
+    print()
 
-        for i, result in enumerate(results, 1):
+    timings = {}
+    for heading, label, prefix, run in COMPARISON_APPROACHES:
+        print(heading)
+        print("-" * 70)
+        start = time.time()
+
+        await run(client, comparison_payloads(prefix))
+
+        timings[label] = time.time() - start
+        print(f"[CLIENT] ⏱️  {label} took: {timings[label]:.2f}s\n")
+
+    # Summary
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    baseline = next(iter(timings.values()))
+    for i, (label, elapsed) in enumerate(timings.items()):
+        comparison = "baseline" if i == 0 else f"{baseline / elapsed:.2f}x faster"
+        print(f"{label + ':':<19}{elapsed:.2f}s ({comparison})")
+    print()
+    print("💡 Key insight: asyncio.gather ALSO gives you concurrency!")
+    print("   Both approaches run tasks in parallel with similar performance.")
+    print()
+    print("   So when should you use task=True? When you need:")
+    print("   - Status polling while tasks run")
+    print("   - Fire-and-forget (submit now, check later)")
+    print("   - Ability to do other work before checking results")
+    print()
+
+    # Show what you CAN'T do with asyncio.gather
+    print("Example: What tasks=True enables (impossible with asyncio.gather)")
+    print("-" * 70)
+
+    # Submit tasks
+    long_task = await client.call_tool(
+        "long_running_task",
+        {"duration": 5, "task_name": "long-running"},
+        task=True,
+    )
+    print("[CLIENT] Submitted long task (5s), doing other work...")
+
+    # Do other work while it runs!
+    for i in range(3):
+        await asyncio.sleep(1)
+        status = await long_task.status()
+        print(f"  [{i+1}s] Task status: {status.status} (still working...)")
+
+    # Get result when ready
+    print("[CLIENT] Now waiting for final result...")
+    result = await long_task.result()
+    print(f"[CLIENT] Got result: {result.data['message']}")
+    print()
+    print("⚠️  You can't poll status like this with asyncio.gather!")
+    print()
+
+    # Example 1: Simple task with direct await
+    print("Example 1: Call task and await immediately")
+    print("-" * 60)
+    task1 = await client.call_tool(
+        "long_running_task",
+        {"duration": 2, "task_name": "quick-task"},
+        task=True,
+    )
+    print(f"[CLIENT] Task object created: {type(task1).__name__}")
+    result1 = await task1
+    print(f"[CLIENT] Result: {result1.data}\n")
+
+    # Example 2: Multiple concurrent tasks
+    print("Example 2: Launch multiple tasks concurrently")
+    print("-" * 60)
+    start_time = time.time()
+    print(f"[CLIENT] Starting 3 tasks simultaneously at {datetime.now().strftime('%H:%M:%S')}...")
+
+    # Submit all three together so no submission waits on another
+    task_a, task_b, task_c = await asyncio.gather(
+        client.call_tool("long_running_task", {"duration": 3, "task_name": "task-A"}, task=True),
+        client.call_tool("long_running_task", {"duration": 2, "task_name": "task-B"}, task=True),
+        client.call_tool("long_running_task", {"duration": 1, "task_name": "task-C"}, task=True),
+    )
+
+    print("[CLIENT] All tasks launched, waiting for completion...")
+
+    # Gather results (they'll complete in different order based on duration).
+    # A failing task is reported alongside the others instead of hiding their results.
+    results = await asyncio.gather(task_a, task_b, task_c, return_exceptions=True)
+
+    elapsed = time.time() - start_time
+    print(f"[CLIENT] All tasks completed in {elapsed:.2f}s (3+2+1=6s if serial, ~3s if concurrent)")
+
+    for i, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            print(f"[CLIENT] Task {i} failed: {result}")
+        else:
             print(f"[CLIENT] Task {i} result: {result.data['message']}")
 
-        # Example 3: Polling multiple task statuses concurrently
-        print("\nExample 3: Poll multiple task statuses while they run")
-        print("-" * 60)
-        print("[CLIENT] Starting 3 tasks with different durations...")
-
-        # Start 3 tasks
-        poll_a = await client.call_tool(
-            "long_running_task",
-            {"duration": 5, "task_name": "poll-A"},
-            task=True,
-        )
-        poll_b = await client.call_tool(
-            "long_running_task",
-            {"duration": 3, "task_name": "poll-B"},
-            task=True,
-        )
-        poll_c = await client.call_tool(
-            "long_running_task",
-            {"duration": 2, "task_name": "poll-C"},
-            task=True,
-        )
-
-        print("[CLIENT] All tasks launched, polling their statuses...\n")
-
-        # Poll all tasks every 0.5 seconds and show their states
-        tasks_map = {"poll-A (5s)": poll_a, "poll-B (3s)": poll_b, "poll-C (2s)": poll_c}
-        completed_tasks = set()
-
-        while len(completed_tasks) < len(tasks_map):
-            states = []
-            for name, task in tasks_map.items():
-                if name not in completed_tasks:
-                    status = await task.status()
-                    state_str = f"{name}: {status.status}"
-                    states.append(state_str)
-
-                    if status.status in ["completed", "failed", "cancelled"]:
-                        completed_tasks.add(name)
-                        states[-1] += " ✓"
-                else:
-                    states.append(f"{name}: completed ✓")
-
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] " + " | ".join(states))
-
-            if len(completed_tasks) < len(tasks_map):
-                await asyncio.sleep(0.5)
+    # Example 3: Watching multiple tasks and handling each as it finishes
+    print("\nExample 3: Watch multiple tasks and print each result as it finishes")
+    print("-" * 60)
+    print("[CLIENT] Starting 3 tasks with different durations...")
+
+    # Start 3 tasks, submitting them concurrently
+    watch_a, watch_b, watch_c = await asyncio.gather(
+        client.call_tool("long_running_task", {"duration": 5, "task_name": "watch-A"}, task=True),
+        client.call_tool("long_running_task", {"duration": 3, "task_name": "watch-B"}, task=True),
+        client.call_tool("long_running_task", {"duration": 2, "task_name": "watch-C"}, task=True),
+    )
+
+    print("[CLIENT] All tasks launched, waiting for each one to finish...\n")
+
+    # Show every task's state, redrawing the line only when it changes.
+    # Statuses are fetched once up front; after that each task's result is
+    # awaited directly, so it's printed the moment that task finishes.
+    tasks_map = {"watch-A (5s)": watch_a, "watch-B (3s)": watch_b, "watch-C (2s)": watch_c}
+    statuses = await asyncio.gather(*(task.status() for task in tasks_map.values()))
+    display = {
+        name: f"{name}: {status.status}" for name, status in zip(tasks_map, statuses)
+    }
+    print(f"[{time.strftime('%H:%M:%S')}] " + " | ".join(display.values()))
+    waiters = {asyncio.create_task(task.result()): name for name, task in tasks_map.items()}
+
+    try:
+        while waiters:
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            messages = []
+            for waiter in done:
+                name = waiters.pop(waiter)
+                try:
+                    messages.append(waiter.result().data["message"])
+                    display[name] = f"{name}: completed ✓"
+                except Exception as e:
+                    # A failed or cancelled task raises - show its real final state
+                    status = await tasks_map[name].status()
+                    display[name] = f"{name}: {status.status} ✗"
+                    messages.append(f"{name} did not complete: {e}")
+
+            print(f"[{time.strftime('%H:%M:%S')}] " + " | ".join(display.values()))
+            for message in messages:
+                print(f"  → {message}")
+    finally:
+        # Don't leave waiters behind if we're interrupted part way through
+        for waiter in waiters:
+            waiter.cancel()
+
+    print(f"\n[CLIENT] All tasks finished!\n")
+
+    # Example 4: Compare with instant tool
+    print("Example 4: Compare with non-task tool")
+    print("-" * 60)
+    instant_result = await client.call_tool(
+        "instant_tool", {"message": "This returns immediately"}
+    )
+    print(f"[CLIENT] Instant tool result: {instant_result.data}\n")
 
-        print(f"\n[CLIENT] All tasks completed!\n")
+    print("=" * 60)
+    print("Demo completed!")
+    print("=" * 60)
 
-        # Example 4: Compare with instant tool
-        print("Example 4: Compare with non-task tool")
-        print("-" * 60)
-        instant_result = await client.call_tool(
-            "instant_tool", {"message": "This returns immediately"}
-        )
-        print(f"[CLIENT] Instant tool result: {instant_result.data}\n")
 
-        print("=" * 60)
-        print("Demo completed!")
-        print("=" * 60)
+async def main():
+    # One client session for the whole demo, so session setup isn't part of
+    # any example's timings
+    async with Client(server) as client:
+        await run_demo(client)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_demo())
+    event_loop.run(main())
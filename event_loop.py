@@ -0,0 +1,35 @@
+"""
+Shared entry point for running the demos and servers.
+
+Runs a coroutine on uvloop when it is installed (falling back to the stock
+asyncio loop), with the eager task factory installed on whichever loop is used.
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+try:
+    # Faster drop-in event loop; not available on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run `main` to completion on a fresh event loop, like asyncio.run.
+
+    Eager tasks run until their first real suspension point, so work that
+    completes without blocking skips a trip through the event loop.
+
+    Args:
+        main: The coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+        return runner.run(main)
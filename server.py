@@ -8,11 +8,11 @@ import asyncio
 import time
 from datetime import datetime
 
-from fastmcp import FastMCP, settings
+import httpx
+from fastmcp import FastMCP
+from fastmcp.dependencies import Progress
 
-# Enable experimental task support
-settings.experimental.enable_docket = True
-settings.experimental.enable_tasks = True
+import event_loop
 
 # Create the FastMCP server instance
 mcp = FastMCP(
@@ -20,20 +20,44 @@ mcp = FastMCP(
     instructions="A demo server showcasing background task execution with SEP-1686",
 )
 
+# Shared by every fetch_data call, so concurrent fetches reuse pooled
+# connections. Build remote clients once like this rather than per call inside
+# a tool body. It lives for the whole process, since lifespan is entered per
+# in-memory client session.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=50),
+    timeout=10.0,
+)
+
+# fetch_data only requests URLs on these hosts, so callers can't point it at
+# internal services. Add the hosts you trust.
+FETCH_ALLOWED_HOSTS = frozenset({"example.com", "httpbin.org"})
+
+# Largest response body fetch_data will read, in bytes (after decompression)
+MAX_FETCH_BYTES = 1024 * 1024
+
 
 @mcp.tool(task=True)
-async def slow_calculation(n: int) -> dict:
+async def slow_calculation(n: int, progress: Progress = Progress()) -> dict:
     """
     Simulates a long-running calculation by sleeping for n seconds.
 
+    Sleeps one second at a time and reports progress after each step.
+
     Args:
         n: Number of seconds to sleep (simulating computation time)
+        progress: Task progress, advanced once per step
 
     Returns:
         A dictionary with the result and timing information
     """
     start_time = time.time()
-    await asyncio.sleep(n)  # Non-blocking async sleep
+    await progress.set_total(max(n, 1))
+    for _ in range(n):
+        await asyncio.sleep(1)  # Non-blocking async sleep
+        await progress.increment()
+    if n <= 0:
+        await progress.increment()  # No steps to run, so report 1/1 rather than 0/1
     end_time = time.time()
 
     return {
@@ -46,15 +70,43 @@ async def slow_calculation(n: int) -> dict:
 @mcp.tool(task=True)
 async def fetch_data(source: str, delay: int = 3) -> dict:
     """
-    Simulates fetching data from a remote source with async delay.
+    Fetches data from a remote source, or simulates it with an async delay.
+
+    URLs must be on a host in FETCH_ALLOWED_HOSTS, and their response is
+    streamed and rejected once it exceeds MAX_FETCH_BYTES.
 
     Args:
-        source: The name of the data source to fetch from
-        delay: Seconds to wait before returning data
+        source: An http(s) URL to fetch, or the name of a simulated data source
+        delay: Seconds to wait before returning simulated data
 
     Returns:
-        Simulated data from the source
+        Data from the source. Both kinds of source return the same keys; a URL's
+        response body is the single item in "data", with no added delay.
+
+    Raises:
+        ValueError: If the URL's host is not allowed or its response is too large
     """
+    if source.startswith(("http://", "https://")):
+        host = httpx.URL(source).host
+        if host not in FETCH_ALLOWED_HOSTS:
+            raise ValueError(f"fetch_data may not request host {host!r}")
+
+        body = bytearray()
+        async with http_client.stream("GET", source) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_FETCH_BYTES:
+                    raise ValueError(f"Response from {source} exceeds {MAX_FETCH_BYTES} bytes")
+            text = body.decode(response.encoding or "utf-8", errors="replace")
+
+        return {
+            "source": source,
+            "data": [text],
+            "fetched_at": datetime.now().isoformat(),
+            "delay_seconds": 0,
+        }
+
     await asyncio.sleep(delay)
 
     return {
@@ -66,23 +118,32 @@ async def fetch_data(source: str, delay: int = 3) -> dict:
 
 
 @mcp.tool(task=True)
-async def process_batch(items: list[str], process_time_per_item: float = 0.5) -> dict:
+async def process_batch(
+    items: list[str],
+    process_time_per_item: float = 0.5,
+    progress: Progress = Progress(),
+) -> dict:
     """
-    Simulates batch processing of items.
+    Simulates batch processing of items, reporting progress after each one.
 
     Args:
         items: List of items to process
         process_time_per_item: Time in seconds to process each item
+        progress: Task progress, advanced once per item
 
     Returns:
         Processing results and statistics
     """
     start_time = time.time()
     processed = []
+    await progress.set_total(max(len(items), 1))
 
     for item in items:
         await asyncio.sleep(process_time_per_item)  # Non-blocking async sleep
         processed.append(f"processed_{item}")
+        await progress.increment()
+    if not items:
+        await progress.increment()  # Empty batch, so report 1/1 rather than 0/1
 
     end_time = time.time()
 
@@ -110,4 +171,4 @@ def quick_task(message: str) -> str:
 
 if __name__ == "__main__":
     # Run the server with stdio transport
-    mcp.run(transport="stdio")
+    event_loop.run(mcp.run_async(transport="stdio"))
@@ -4,12 +4,20 @@ Helper to add logging to FastMCP task polling.
 This monkey-patches the Client.wait_for_task method to add detailed polling logs.
 """
 
+import asyncio
 import logging
 import time
 from typing import Any
 
 logger = logging.getLogger("task-polling")
 
+# States after which a task will not change again
+TERMINAL_STATES = frozenset({"completed", "failed", "cancelled"})
+
+# Polls back off by this factor while the state is unchanged, up to the cap
+POLL_BACKOFF_FACTOR = 1.6
+MAX_POLL_INTERVAL = 1.0
+
 
 def enable_task_polling_logs(client: Any) -> None:
     """
@@ -34,49 +42,55 @@ def enable_task_polling_logs(client: Any) -> None:
         poll_interval: float = 0.05,
     ):
         """Wrapped version of wait_for_task with logging."""
-        logger.info(f"⏳ Polling task {task_id[:8]}... (target: {state or 'completion'})")
+        short_id = task_id[:8]
+        logger.info("⏳ Polling task %s... (target: %s)", short_id, state or "completion")
 
-        start = time.time()
+        start = time.monotonic()
         last_status = None
+        interval = poll_interval
         poll_count = 0
         last_log_time = 0
         log_throttle = 2.0  # Log every 2 seconds max
 
-        # Call original but intercept to add logging
-        terminal_states = {"completed", "failed"}
-
-        while time.time() - start < timeout:
+        while time.monotonic() - start < timeout:
             status = await client.get_task_status(task_id)
             current_state = status.status
             poll_count += 1
-            elapsed = time.time() - start
+            elapsed = time.monotonic() - start
 
             # Log state transitions
             if current_state != last_status:
-                logger.info(f"  Task {task_id[:8]}: {last_status or 'unknown'} → {current_state}")
+                logger.info("  Task %s: %s → %s", short_id, last_status or "unknown", current_state)
                 last_status = current_state
                 last_log_time = elapsed
+                interval = poll_interval  # Something changed, so check again soon
             # Throttled progress logs
             elif elapsed - last_log_time >= log_throttle:
-                logger.info(f"  Task {task_id[:8]}: still {current_state} ({poll_count} polls, {elapsed:.1f}s)")
+                logger.info(
+                    "  Task %s: still %s (%d polls, %.1fs)", short_id, current_state, poll_count, elapsed
+                )
                 last_log_time = elapsed
 
             # Check if we've reached the desired state
             if state is not None:
                 if current_state == state:
-                    logger.info(f"✓ Task {task_id[:8]} reached '{state}' after {elapsed:.1f}s ({poll_count} polls)")
+                    logger.info(
+                        "✓ Task %s reached '%s' after %.1fs (%d polls)", short_id, state, elapsed, poll_count
+                    )
                     return status
             else:
                 # No specific state requested - wait for terminal state
-                if current_state in terminal_states:
-                    logger.info(f"✓ Task {task_id[:8]} {current_state} after {elapsed:.1f}s ({poll_count} polls)")
+                if current_state in TERMINAL_STATES:
+                    logger.info(
+                        "✓ Task %s %s after %.1fs (%d polls)", short_id, current_state, elapsed, poll_count
+                    )
                     return status
 
-            import asyncio
-            await asyncio.sleep(poll_interval)
+            await asyncio.sleep(interval)
+            interval = min(interval * POLL_BACKOFF_FACTOR, MAX_POLL_INTERVAL)
 
         # Timeout
-        logger.error(f"✗ Task {task_id[:8]} timeout after {timeout}s ({poll_count} polls)")
+        logger.error("✗ Task %s timeout after %ss (%d polls)", short_id, timeout, poll_count)
         if state is not None:
             raise TimeoutError(
                 f"Task {task_id} did not reach state '{state}' within {timeout}s"